@@ -1,11 +1,13 @@
 import logging
-from typing import Any
-from sqlalchemy.orm import Session, sessionmaker
-from sqlalchemy import create_engine
-from sqlalchemy.exc import IntegrityError
-from datetime import datetime
+import uuid
+from functools import lru_cache
+from itertools import islice
+from typing import Any, Iterable
+from sqlalchemy.orm import Session, selectinload, sessionmaker
+from sqlalchemy import Engine, Index, create_engine, event, select
+from datetime import date, datetime
 
-from models import Paper,Category,Author,Base
+from models import Paper,Category,Author,Base,paper_authors,paper_categories
 
 
 
@@ -13,21 +15,127 @@ from models import Paper,Category,Author,Base
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
+# One engine per database URL for the lifetime of the process
+_engines: dict[str, Engine] = {}
+
+# Fields a paper needs before the bulk loader will accept it
+REQUIRED_PAPER_FIELDS = (
+    'id', 'title', 'summary', 'content', 'source', 'authors', 'categories',
+    'primary_category', 'published', 'updated'
+)
+
+# Raw SQL for the bulk-load path; public_id is generated here, timestamps by the database
+PAPER_COLUMNS = (
+    'public_id', 'arxiv_id', 'title', 'summary', 'content', 'source', 'comment',
+    'journal_ref', 'primary_category', 'published', 'updated'
+)
+INSERT_PAPER_SQL = (
+    f"INSERT OR IGNORE INTO papers ({', '.join(PAPER_COLUMNS)}) "
+    f"VALUES ({', '.join('?' * len(PAPER_COLUMNS))})"
+)
+INSERT_AUTHOR_SQL = "INSERT OR IGNORE INTO authors (public_id, name) VALUES (?, ?)"
+INSERT_CATEGORY_SQL = "INSERT OR IGNORE INTO categories (public_id, code, name) VALUES (?, ?, ?)"
+INSERT_PAPER_AUTHOR_SQL = "INSERT INTO paper_authors (paper_id, author_id) VALUES (?, ?)"
+INSERT_PAPER_CATEGORY_SQL = "INSERT INTO paper_categories (paper_id, category_id) VALUES (?, ?)"
+INSERT_PAPER_REFERENCE_SQL = "INSERT INTO paper_references (citing_paper_id, cited_paper_id) VALUES (?, ?)"
+
+def get_engine(db_url: str = 'sqlite:///arxiv_papers.db') -> Engine:
+    """
+    Get the engine for a database URL, creating it and its tables on first use.
+    
+    Engines are cached per URL, so the schema is only checked with create_all
+    once per process. Callers that want a fresh schema call Base.metadata.drop_all
+    and Base.metadata.create_all explicitly.
+    
+    Args:
+        db_url: Database URL (defaults to SQLite)
+    
+    Returns:
+        Engine: SQLAlchemy engine
+    """
+    if db_url in _engines:
+        return _engines[db_url]
+
+    engine = create_engine(db_url, echo=False)
+
+    if engine.dialect.name == 'sqlite':
+        # WAL + synchronous=NORMAL avoids an fsync per commit; larger cache keeps indexes in memory
+        @event.listens_for(engine, "connect")
+        def set_sqlite_pragmas(dbapi_connection, connection_record):
+            cursor = dbapi_connection.cursor()
+            cursor.execute("PRAGMA journal_mode=WAL")
+            cursor.execute("PRAGMA synchronous=NORMAL")
+            cursor.execute("PRAGMA cache_size=-200000")
+            cursor.execute("PRAGMA temp_store=MEMORY")
+            cursor.close()
+
+    Base.metadata.create_all(engine)
+    _engines[db_url] = engine
+    return engine
+
+@lru_cache(maxsize=None)
 def get_or_create_database(db_url: str = 'sqlite:///arxiv_papers.db') -> sessionmaker:
     """
     Create the SQLite database, tables and return a session factory.
     
+    The session factory is cached per URL and can be reused across batches.
+    
     Args:
         db_url: Database URL (defaults to SQLite)
     
     Returns:
         sessionmaker: SQLAlchemy session factory
     """
-    engine = create_engine(db_url, echo=False)
-    Base.metadata.create_all(engine)
-    return sessionmaker(bind=engine)
+    # Keep loaded objects usable across batch commits instead of re-SELECTing them
+    return sessionmaker(bind=get_engine(db_url), expire_on_commit=False)
 
-def parse_authors(authors_str: str) -> list[dict[str, str]]:
+def get_bulk_load_indexes() -> list[Index]:
+    """
+    Get the secondary indexes that can be dropped while bulk loading.
+    
+    Unique indexes stay in place since INSERT OR IGNORE and the arxiv_id
+    lookups rely on them.
+    
+    Returns:
+        list of non-unique indexes on the author/category tables and their junction tables
+    """
+    tables = (Author.__table__, Category.__table__, paper_authors, paper_categories)
+    return [index for table in tables for index in table.indexes if not index.unique]
+
+def execute_many(session: Session, sql: str, rows: list[tuple]) -> None:
+    """
+    Run a parameterized statement for many rows straight on the DBAPI cursor.
+    
+    The cursor belongs to the session's current connection, so the rows are part
+    of the session transaction, but SQLAlchemy statement compilation and per-row
+    parameter processing are skipped entirely.
+    
+    Args:
+        session: SQLAlchemy session
+        sql: SQL statement with qmark placeholders
+        rows: list of parameter tuples
+    """
+    if not rows:
+        return
+    cursor = session.connection().connection.cursor()
+    try:
+        cursor.executemany(sql, rows)
+    finally:
+        cursor.close()
+
+def parse_authors(authors_str: str) -> list[str]:
+    """
+    Parse author string into list of author names.
+    
+    Args:
+        authors_str: Comma-separated string of author names
+    
+    Returns:
+        list of non-empty author names
+    """
+    return [name.strip() for name in authors_str.split(',') if name.strip()]
+
+def parse_authors_rich(authors_str: str) -> list[dict[str, str]]:
     """
     Parse author string into list of author dictionaries.
     Now handles additional author information if available.
@@ -39,8 +147,7 @@ def parse_authors(authors_str: str) -> list[dict[str, str]]:
         list of dictionaries containing author information
     """
     authors = []
-    for name in authors_str.split(','):
-        name = name.strip()
+    for name in parse_authors(authors_str):
         # Basic parsing - could be enhanced to extract email/institution if available
         author_info = {
             'name': name,
@@ -50,7 +157,19 @@ def parse_authors(authors_str: str) -> list[dict[str, str]]:
         authors.append(author_info)
     return authors
 
-def parse_categories(categories_str: str) -> list[dict[str, str]]:
+def parse_categories(categories_str: str) -> list[str]:
+    """
+    Parse category string into list of category codes.
+    
+    Args:
+        categories_str: Comma-separated string of category codes
+    
+    Returns:
+        list of non-empty category codes
+    """
+    return [code.strip() for code in categories_str.split(',') if code.strip()]
+
+def parse_categories_rich(categories_str: str) -> list[dict[str, str]]:
     """
     Parse category string into list of category dictionaries.
     
@@ -61,8 +180,7 @@ def parse_categories(categories_str: str) -> list[dict[str, str]]:
         list of dictionaries containing category information
     """
     categories = []
-    for code in categories_str.split(','):
-        code = code.strip()
+    for code in parse_categories(categories_str):
         # You might want to maintain a mapping of category codes to full names/descriptions
         category_info = {
             'code': code,
@@ -72,51 +190,126 @@ def parse_categories(categories_str: str) -> list[dict[str, str]]:
         categories.append(category_info)
     return categories
 
-def get_or_create_author(
+def parse_date(value: Any) -> int | None:
+    """
+    Parse a paper date into its YYYYMMDD integer.
+    
+    Args:
+        value: YYYYMMDD string or integer, ISO 8601 date string, or date/datetime
+    
+    Returns:
+        YYYYMMDD integer, or None if the value is not a valid date
+    """
+    if isinstance(value, date):
+        return int(value.strftime('%Y%m%d'))
+    if isinstance(value, bool) or not isinstance(value, (int, str)):
+        return None
+
+    text = str(value).strip()
+    try:
+        if len(text) == 8 and text.isdigit():
+            parsed = datetime.strptime(text, '%Y%m%d')
+        else:
+            parsed = datetime.fromisoformat(text)
+    except ValueError:
+        return None
+    return int(parsed.strftime('%Y%m%d'))
+
+def insert_authors(
     session: Session, 
-    author_info: dict[str, str]
-) -> Author:
+    names: list[str]
+) -> dict[str, int]:
     """
-    Get existing author or create new one.
+    Insert authors with INSERT OR IGNORE and resolve their ids with a single IN query.
+    
+    Authors that already exist are left untouched, so no per-name SELECT is needed
+    to check for uniqueness before inserting.
     
     Args:
         session: SQLAlchemy session
-        author_info: dictionary containing author information
+        names: list of author names
     
     Returns:
-        Author: Author instance
-    """
-    author = session.query(Author).filter_by(name=author_info['name']).first()
-    if not author:
-        author = Author(
-            name=author_info['name'],
-            email=author_info['email'],
-            institution=author_info['institution']
-        )
-        session.add(author)
-    return author
+        dict mapping author name to author id
+    """
+    if not names:
+        return {}
+
+    names = list(dict.fromkeys(names))
+    execute_many(session, INSERT_AUTHOR_SQL, [(str(uuid.uuid4()), name) for name in names])
+    return dict(session.connection().execute(
+        select(Author.name, Author.id).where(Author.name.in_(names))
+    ).all())
+
+@event.listens_for(Session, "after_rollback")
+def clear_arxiv_id_map(session: Session) -> None:
+    """Drop the cached arxiv_id map on rollback, since rolled back ids can be reused"""
+    session.info.pop('arxiv_id_map', None)
+    session.info.pop('arxiv_id_map_loaded', None)
+
+def get_arxiv_id_map(session: Session, load_all: bool = False) -> dict[str, int]:
+    """
+    Get the arxiv_id -> primary key map cached on the session.
+    
+    The map is kept in session.info until the session rolls back. By default it
+    only holds ids resolved so far; with load_all the whole papers table is read
+    once with a single SELECT, which only pays off for bulk callers.
+    
+    Args:
+        session: SQLAlchemy session
+        load_all: Whether to load the id of every paper in the database
+    
+    Returns:
+        dict mapping arxiv_id to paper id
+    """
+    arxiv_id_map = session.info.setdefault('arxiv_id_map', {})
+    if load_all and not session.info.get('arxiv_id_map_loaded'):
+        arxiv_id_map.update(session.execute(select(Paper.arxiv_id, Paper.id)).all())
+        session.info['arxiv_id_map_loaded'] = True
+    return arxiv_id_map
 
 def get_paper(
     session: Session, 
-    paper_info: dict[str, str],
+    paper_info: dict[str, Any],
     get_by="id",
-) -> Paper:
+) -> Paper | None:
     """
     Get existing paper
     
+    Lookups by primary key or arxiv_id go through session.get(), which returns
+    papers already in the identity map without issuing any SQL. An arxiv_id not
+    resolved before in this session costs one indexed SELECT.
+    
     Args:
         session: SQLAlchemy session
         paper_info: dictionary containing paper information
-        get_by: either arxiv_id or title.
+        get_by: either id (arxiv_id or integer primary key) or title.
     
     Returns:
-        paper: Paper instance
+        paper: Paper instance or None if not found
     """
+    # Authors/categories are loaded lazily, so fetch them up front for to_dict()
+    options = [selectinload(Paper.authors), selectinload(Paper.categories)]
     if get_by == "id":
-        paper = session.query(Paper).filter_by(arxiv_id=paper_info[get_by]).first()
+        key = paper_info[get_by]
+        if isinstance(key, int):
+            return session.get(Paper, key, options=options)
+
+        arxiv_id_map = get_arxiv_id_map(session)
+        if key in arxiv_id_map:
+            paper = session.get(Paper, arxiv_id_map[key], options=options)
+            if paper is not None and paper.arxiv_id == key:
+                return paper
+            # Stale entry: the paper was deleted or its id reused by another paper
+            del arxiv_id_map[key]
+
+        # Paper may not be resolved yet or may have been added after the map was built
+        paper = session.query(Paper).options(*options).filter_by(arxiv_id=key).first()
+        if paper:
+            arxiv_id_map[key] = paper.id
+        return paper
     elif get_by == "title":
-        paper = session.query(Paper).filter_by(title=paper_info[get_by]).first()
-    return paper
+        return session.query(Paper).options(*options).filter_by(title=paper_info[get_by]).first()
 
 def get_papers(
     session: Session,
@@ -134,143 +327,342 @@ def get_papers(
     Returns:
         papers: list[Paper] instance
     """
-    query = session.query(Paper)
+    query = session.query(Paper).options(
+        selectinload(Paper.authors),
+        selectinload(Paper.categories)
+    )
     if all:
         return query.all()
     else:
         return query.limit(limit).all()
 
-def get_or_create_category(
+def insert_categories(
     session: Session, 
-    category_info: dict[str, str]
-) -> Category:
+    codes: list[str]
+) -> dict[str, int]:
     """
-    Get existing category or create new one.
+    Insert categories with INSERT OR IGNORE and resolve their ids with a single IN query.
     
     Args:
         session: SQLAlchemy session
-        category_info: dictionary containing category information
+        codes: list of category codes
     
     Returns:
-        Category: Category instance
-    """
-    category = session.query(Category).filter_by(code=category_info['code']).first()
-    if not category:
-        category = Category(
-            code=category_info['code'],
-            name=category_info['name'],
-            description=category_info['description']
-        )
-        session.add(category)
-    return category
+        dict mapping category code to category id
+    """
+    if not codes:
+        return {}
+
+    codes = list(dict.fromkeys(codes))
+    # Category names default to the code until a code -> name mapping exists
+    execute_many(session, INSERT_CATEGORY_SQL, [(str(uuid.uuid4()), code, code) for code in codes])
+    return dict(session.connection().execute(
+        select(Category.code, Category.id).where(Category.code.in_(codes))
+    ).all())
 
 def load_paper_data(
     session: Session, 
-    paper_data: dict[str, Any],
-    batch_size: int = 100
-) -> Paper | None:
+    paper_data: dict[str, Any]
+) -> Paper:
     """
     Load a single paper's data into the database.
     
+    Errors are left to the caller, which owns the session transaction; check the
+    paper with is_valid_paper first to reject bad records without raising.
+    
     Args:
         session: SQLAlchemy session
         paper_data: dictionary containing paper data
-        batch_size: Number of records to process before committing
     
     Returns:
-        Paper or None: Created paper instance or None if error occurred
+        Paper: Created paper instance, added to the session but not committed
     """
-    try:
-        # Parse and create/get authors
-        author_objects = [
-            get_or_create_author(session, author_info)
-            for author_info in parse_authors(paper_data['authors'])
-        ]
-
-        # Parse and create/get categories
-        category_objects = [
-            get_or_create_category(session, category_info)
-            for category_info in parse_categories(paper_data['categories'])
-        ]
-
-        # Create paper
-        paper = Paper(
-            arxiv_id=paper_data['id'],
-            title=paper_data['title'],
-            summary=paper_data['summary'],
-            content=paper_data['content'],
-            source=paper_data['source'],
-            comment=paper_data.get('comment'),
-            journal_ref=paper_data.get('journal_ref'),
-            primary_category=paper_data['primary_category'],
-            published=paper_data['published'],
-            updated=paper_data['updated'],
-            authors=author_objects,
-            categories=category_objects
+    published = parse_date(paper_data['published'])
+    updated = parse_date(paper_data['updated'])
+    if published is None or updated is None:
+        raise ValueError(
+            f"invalid published/updated date {paper_data['published']!r}/{paper_data['updated']!r}"
         )
-        session.add(paper)
 
-        # Store references for later processing
-        if paper_data.get('references'):
-            paper._temp_citation_ids = list(paper_data['references'].values())
+    # Parse and create/get authors
+    author_names = parse_authors(paper_data['authors'])
+    author_ids = insert_authors(session, author_names)
+    authors_by_id = {
+        author.id: author
+        for author in session.query(Author).filter(Author.id.in_(author_ids.values())).all()
+    }
+    author_objects = [authors_by_id[author_ids[name]] for name in dict.fromkeys(author_names)]
 
-        return paper
+    # Parse and create/get categories
+    category_codes = parse_categories(paper_data['categories'])
+    category_ids = insert_categories(session, category_codes)
+    categories_by_id = {
+        category.id: category
+        for category in session.query(Category).filter(Category.id.in_(category_ids.values())).all()
+    }
+    category_objects = [categories_by_id[category_ids[code]] for code in dict.fromkeys(category_codes)]
 
-    except IntegrityError as e:
-        session.rollback()
-        logger.error(f"Integrity error loading paper {paper_data['id']}: {str(e)}")
-        return None
-    except Exception as e:
-        session.rollback()
-        logger.error(f"Unexpected error loading paper {paper_data['id']}: {str(e)}")
-        return None
+    # Create paper
+    paper = Paper(
+        arxiv_id=paper_data['id'],
+        title=paper_data['title'],
+        summary=paper_data['summary'],
+        content=paper_data['content'],
+        source=paper_data['source'],
+        comment=paper_data.get('comment'),
+        journal_ref=paper_data.get('journal_ref'),
+        primary_category=paper_data['primary_category'],
+        published=published,
+        updated=updated,
+        authors=author_objects,
+        categories=category_objects
+    )
+    session.add(paper)
+
+    # Resolve all cited papers with a single IN query
+    if paper_data.get('references'):
+        paper.citations = session.query(Paper).filter(
+            Paper.arxiv_id.in_(set(paper_data['references'].values()))
+        ).all()
+
+    return paper
+    
+def build_paper_row(paper_data: dict[str, Any]) -> tuple:
+    """
+    Build the papers table row for a single paper.
+    
+    Args:
+        paper_data: dictionary containing paper data
+    
+    Returns:
+        tuple of values in PAPER_COLUMNS order
+    """
+    return (
+        str(uuid.uuid4()),
+        paper_data['id'],
+        paper_data['title'],
+        paper_data['summary'],
+        paper_data['content'],
+        paper_data['source'],
+        paper_data.get('comment'),
+        paper_data.get('journal_ref'),
+        paper_data['primary_category'],
+        parse_date(paper_data['published']),
+        parse_date(paper_data['updated']),
+    )
+
+def is_valid_paper(paper_data: dict[str, Any]) -> bool:
+    """
+    Check that a paper has every field the bulk loader needs.
+    
+    Every conversion the loaders do (date parsing, splitting authors and
+    categories, reading references) is checked here, so a bad paper is dropped
+    on its own before any batch transaction starts.
+    
+    Args:
+        paper_data: dictionary containing paper data
+    
+    Returns:
+        bool: True if all required fields are present and well-typed and both dates parse
+    """
+    if not all(paper_data.get(field) is not None for field in REQUIRED_PAPER_FIELDS):
+        return False
+    if not isinstance(paper_data['authors'], str) or not isinstance(paper_data['categories'], str):
+        logger.warning(f"Authors and categories of paper {paper_data['id']} must be strings")
+        return False
+    if paper_data.get('references') and not isinstance(paper_data['references'], dict):
+        logger.warning(f"References of paper {paper_data['id']} must be a mapping")
+        return False
+    if parse_date(paper_data['published']) is None or parse_date(paper_data['updated']) is None:
+        logger.warning(
+            f"Invalid published/updated date for paper {paper_data['id']}: "
+            f"{paper_data['published']!r}/{paper_data['updated']!r}"
+        )
+        return False
+    return True
+
+def load_papers_batch(
+    session: Session,
+    batch: list[dict[str, Any]],
+    author_ids: dict[str, int],
+    category_ids: dict[str, int]
+) -> tuple[int, int]:
+    """
+    Bulk insert a batch of papers with raw DBAPI executemany, bypassing the ORM entirely.
+    
+    Papers missing required fields or already in the database are filtered out
+    up front, so a single bad record cannot roll back the rest of the batch.
+    Authors and categories missing from the id maps are inserted with INSERT OR IGNORE,
+    and the maps are only updated once the batch has been committed. Citations are
+    resolved against papers already in the database, including this batch.
     
+    Args:
+        session: SQLAlchemy session
+        batch: list of paper data dictionaries
+        author_ids: name -> id map of every known author
+        category_ids: code -> id map of every known category
+    
+    Returns:
+        tuple of (successful, failed) paper counts
+    """
+    # Keep the first occurrence of each arxiv_id among the valid papers
+    valid_papers = {}
+    for paper_data in batch:
+        if is_valid_paper(paper_data):
+            valid_papers.setdefault(paper_data['id'], paper_data)
+    failed = len(batch) - len(valid_papers)
+    if failed:
+        logger.warning(f"Skipping {failed} invalid or duplicate papers in batch")
+
+    if not valid_papers:
+        return 0, failed
+
+    try:
+        # One explicit transaction per batch; it commits on exit and rolls back on error
+        with session.begin():
+            connection = session.connection()
+
+            existing = set(connection.execute(
+                select(Paper.arxiv_id).where(Paper.arxiv_id.in_(list(valid_papers)))
+            ).scalars())
+            if existing:
+                logger.warning(f"Skipping {len(existing)} papers already in the database")
+                failed += len(existing)
+
+            new_author_names = []
+            new_category_codes = []
+            paper_rows = []
+            paper_links = []
+            pending_refs = []
+
+            # Phase 1: collect unknown authors/categories and build paper rows
+            for arxiv_id, paper_data in valid_papers.items():
+                if arxiv_id in existing:
+                    continue
+
+                author_names = parse_authors(paper_data['authors'])
+                new_author_names.extend(name for name in author_names if name not in author_ids)
+
+                category_codes = parse_categories(paper_data['categories'])
+                new_category_codes.extend(code for code in category_codes if code not in category_ids)
+
+                paper_rows.append(build_paper_row(paper_data))
+                paper_links.append((arxiv_id, dict.fromkeys(author_names), dict.fromkeys(category_codes)))
+                if paper_data.get('references'):
+                    pending_refs.extend(
+                        (arxiv_id, cited_arxiv_id)
+                        for cited_arxiv_id in dict.fromkeys(paper_data['references'].values())
+                    )
+
+            # Phase 2: bulk insert authors, categories and papers
+            new_author_ids = insert_authors(session, new_author_names)
+            new_category_ids = insert_categories(session, new_category_codes)
+            execute_many(session, INSERT_PAPER_SQL, paper_rows)
+            paper_ids = dict(connection.execute(
+                select(Paper.arxiv_id, Paper.id)
+                .where(Paper.arxiv_id.in_([arxiv_id for arxiv_id, _, _ in paper_links]))
+            ).all())
+
+            # Phase 3: link the whole batch to its authors and categories in one INSERT per table
+            paper_author_rows = [
+                (paper_ids[arxiv_id], author_ids.get(name) or new_author_ids[name])
+                for arxiv_id, author_names, _ in paper_links
+                for name in author_names
+            ]
+            paper_category_rows = [
+                (paper_ids[arxiv_id], category_ids.get(code) or new_category_ids[code])
+                for arxiv_id, _, category_codes in paper_links
+                for code in category_codes
+            ]
+            execute_many(session, INSERT_PAPER_AUTHOR_SQL, paper_author_rows)
+            execute_many(session, INSERT_PAPER_CATEGORY_SQL, paper_category_rows)
+
+            # Resolve every cited arxiv_id of the batch in one query; unknown papers are skipped
+            if pending_refs:
+                cited_ids = dict(connection.execute(
+                    select(Paper.arxiv_id, Paper.id)
+                    .where(Paper.arxiv_id.in_({arxiv_id for _, arxiv_id in pending_refs}))
+                ).all())
+                citation_rows = [
+                    (paper_ids[citing_arxiv_id], cited_ids[arxiv_id])
+                    for citing_arxiv_id, arxiv_id in pending_refs
+                    if arxiv_id in cited_ids
+                ]
+                execute_many(session, INSERT_PAPER_REFERENCE_SQL, citation_rows)
+    except Exception as e:
+        logger.error(f"Error loading batch: {str(e)}")
+        return 0, len(batch)
+
+    author_ids.update(new_author_ids)
+    category_ids.update(new_category_ids)
+    return len(paper_rows), failed
+
 def load_dataset_todb(
-    dataset: list[dict[str, Any]], 
+    dataset: Iterable[dict[str, Any]], 
     db_url: str = 'sqlite:///arxiv_papers.db',
-    batch_size: int = 100
+    batch_size: int = 100,
+    drop_indexes: bool = True
 ) -> None:
     """
     Load the entire dataset into the database with batch processing.
     
+    The dataset is consumed lazily one batch at a time, so a generator reading
+    JSONL line by line never has to be materialized in memory.
+    
     Args:
-        dataset: list of paper data dictionaries
+        dataset: iterable of paper data dictionaries
         db_url: Database URL
         batch_size: Number of records to process before committing
+        drop_indexes: Drop secondary indexes during the load and rebuild them afterwards.
+            Worth it for large loads, wasteful when appending a few papers to a big database.
     """
     Session = get_or_create_database(db_url)
+    engine = get_engine(db_url)
+    bulk_load_indexes = get_bulk_load_indexes() if drop_indexes else []
+
+    for index in bulk_load_indexes:
+        index.drop(engine, checkfirst=True)
+    try:
+        load_papers(Session, dataset, batch_size)
+    finally:
+        for index in bulk_load_indexes:
+            index.create(engine, checkfirst=True)
+
+def load_papers(
+    Session: sessionmaker,
+    dataset: Iterable[dict[str, Any]],
+    batch_size: int = 100
+) -> None:
+    """
+    Load papers batch by batch and log loading statistics.
     
-    with Session() as session:
-        total_papers = len(dataset)
+    Args:
+        Session: SQLAlchemy session factory
+        dataset: iterable of paper data dictionaries
+        batch_size: Number of records to process before committing
+    """
+    
+    # Autoflush is pointless here since every write goes through explicit Core INSERTs
+    with Session(autoflush=False) as session:
+        total_papers = 0
         successful_loads = 0
         failed_loads = 0
         
-        logger.info(f"Starting to load {total_papers} papers...")
+        logger.info("Starting to load papers...")
         start_time = datetime.now()
 
-        for i, paper_data in enumerate(dataset, 1):
-            paper = load_paper_data(session, paper_data)
-            
-            if paper:
-                successful_loads += 1
-            else:
-                failed_loads += 1
-
-            # Commit in batches
-            if i % batch_size == 0:
-                try:
-                    session.commit()
-                    logger.info(f"Processed {i}/{total_papers} papers...")
-                except Exception as e:
-                    session.rollback()
-                    logger.error(f"Error committing batch ending at {i}: {str(e)}")
-
-        # Commit any remaining records
-        try:
-            session.commit()
-        except Exception as e:
-            session.rollback()
-            logger.error(f"Error committing final batch: {str(e)}")
+        # Seed the id maps once so repeated authors/categories never hit the database
+        with session.begin():
+            author_ids = dict(session.execute(select(Author.name, Author.id)).all())
+            category_ids = dict(session.execute(select(Category.code, Category.id)).all())
+
+        papers = iter(dataset)
+        while batch := list(islice(papers, batch_size)):
+            successful, failed = load_papers_batch(session, batch, author_ids, category_ids)
+            total_papers += len(batch)
+            successful_loads += successful
+            failed_loads += failed
+            logger.info(f"Processed {total_papers} papers...")
 
         end_time = datetime.now()
         duration = (end_time - start_time).total_seconds()
@@ -281,5 +673,5 @@ def load_dataset_todb(
         - Successfully loaded: {successful_loads}
         - Failed to load: {failed_loads}
         - Time taken: {duration:.2f} seconds
-        - Average rate: {total_papers/duration:.2f} papers/second
+        - Average rate: {total_papers/duration if duration > 0 else 0:.2f} papers/second
         """)
\ No newline at end of file
@@ -0,0 +1,325 @@
+from typing import Any
+import hashlib
+import logging
+import sqlite3
+import time
+import numpy as np
+
+from preprocessor import clean_text
+
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+SIMHASH_BITS = 64
+SHINGLE_SIZE = 5
+# 64-bit simhash split into 4 bands of 16 bits: any two hashes within Hamming
+# distance 3 must agree on at least one band, so band equality finds all candidates
+SIMHASH_BANDS = 4
+BAND_BITS = SIMHASH_BITS // SIMHASH_BANDS
+BAND_MASK = (1 << BAND_BITS) - 1
+# Storage formats for cached vectors; int8 keeps a per-vector absmax scale
+CACHE_DTYPES = ('float32', 'float16', 'int8')
+INT8_MAX = 127
+
+def simhash(text: str) -> int:
+    """
+    Compute a 64-bit SimHash over character 5-gram shingles
+
+    Args:
+        text: Normalized text
+
+    Returns:
+        unsigned 64-bit SimHash
+    """
+    shingles = {text[i:i + SHINGLE_SIZE] for i in range(max(len(text) - SHINGLE_SIZE + 1, 1))}
+    hashes = np.array(
+        [int.from_bytes(hashlib.blake2b(s.encode(), digest_size=8).digest(), 'little') for s in shingles],
+        dtype=np.uint64
+    )
+    # Bit matrix of shape (n_shingles, 64); majority vote per bit position
+    bits = np.unpackbits(hashes.view(np.uint8).reshape(-1, 8), axis=1, bitorder='little')
+    votes = bits.sum(axis=0) * 2 > len(hashes)
+    return int(np.packbits(votes, bitorder='little').view('<u8')[0])
+
+def to_signed(value: int) -> int:
+    """Map an unsigned 64-bit value onto SQLite's signed INTEGER range"""
+    return value - (1 << SIMHASH_BITS) if value >= 1 << (SIMHASH_BITS - 1) else value
+
+def simhash_bands(value: int) -> list[int]:
+    """Split a SimHash into its 16-bit bands"""
+    return [(value >> (band * BAND_BITS)) & BAND_MASK for band in range(SIMHASH_BANDS)]
+
+def quantize(embedding: list[float], dtype: str) -> tuple[bytes, float | None]:
+    """
+    Serialize a vector in the given storage format
+
+    Args:
+        embedding: Vector to serialize
+        dtype: One of CACHE_DTYPES
+
+    Returns:
+        tuple of (vector bytes, int8 scale or None)
+    """
+    vector = np.asarray(embedding, dtype=np.float32)
+    if dtype != 'int8':
+        return vector.astype(dtype).tobytes(), None
+    absmax = float(np.abs(vector).max()) if vector.size else 0.0
+    scale = absmax / INT8_MAX if absmax > 0 else 1.0
+    quantized = np.clip(np.rint(vector / scale), -INT8_MAX, INT8_MAX).astype(np.int8)
+    return quantized.tobytes(), scale
+
+def dequantize(blob: bytes, dtype: str, scale: float | None) -> list[float]:
+    """Inverse of quantize, returning a float32 vector as a list"""
+    vector = np.frombuffer(blob, dtype=dtype).astype(np.float32)
+    if dtype == 'int8':
+        vector *= scale
+    return vector.tolist()
+
+class CachedEncoder:
+    """
+    Wrapper class that caches an encoder's embeddings on disk, keyed by content hash.
+    Texts are normalized with clean_text before hashing, and on an exact miss a
+    near-duplicate (SimHash within max_hamming_distance) reuses its cached vector.
+    Once the cache holds more than max_entries vectors, the least recently used are evicted.
+    """
+    # Stay well under SQLite's bound-parameter limit on lookups
+    LOOKUP_BATCH_SIZE = 500
+
+    def __init__(
+        self,
+        encoder,
+        cache_path: str = 'embedding_cache.db',
+        model_name: str | None = None,
+        max_hamming_distance: int | None = 3,
+        dtype: str = 'float32',
+        max_entries: int | None = 100_000
+    ):
+        """
+        Initialize the cache around an encoder
+
+        Args:
+            encoder: Model for generating embeddings
+            cache_path: Path of the SQLite file holding cached vectors
+            model_name: Name mixed into the hash so different models never share vectors.
+                Defaults to the encoder's name attribute.
+            max_hamming_distance: Largest SimHash distance treated as a near-duplicate
+                (at most 3), or None to only reuse exact matches.
+            dtype: Storage format of new cache entries: float32, float16 (half the size)
+                or int8 with a per-vector scale (a quarter). Vectors are always
+                returned as float32.
+            max_entries: Most vectors kept on disk before least recently used ones are
+                evicted, or None for an unbounded cache.
+        """
+        if max_hamming_distance is not None and not 0 <= max_hamming_distance < SIMHASH_BANDS:
+            raise ValueError(f"max_hamming_distance must be between 0 and {SIMHASH_BANDS - 1}")
+        if dtype not in CACHE_DTYPES:
+            raise ValueError(f"dtype must be one of {CACHE_DTYPES}")
+        if max_entries is not None and max_entries < 1:
+            raise ValueError("max_entries must be positive or None")
+
+        self.encoder = encoder
+        self.model_name = model_name or getattr(encoder, 'name', type(encoder).__name__)
+        self.max_hamming_distance = max_hamming_distance
+        self.dtype = dtype
+        self.max_entries = max_entries
+        self.connection = sqlite3.connect(cache_path)
+        self.connection.execute("PRAGMA journal_mode=WAL")
+        self.connection.execute("PRAGMA synchronous=NORMAL")
+        self.connection.execute(
+            "CREATE TABLE IF NOT EXISTS embeddings "
+            "(hash BLOB PRIMARY KEY, vec BLOB NOT NULL, dtype TEXT NOT NULL DEFAULT 'float32', scale REAL, "
+            "last_used REAL NOT NULL DEFAULT 0)"
+        )
+        # Caches written before per-row storage formats only hold float32 vectors
+        columns = {row[1] for row in self.connection.execute("PRAGMA table_info(embeddings)")}
+        if 'dtype' not in columns:
+            self.connection.execute("ALTER TABLE embeddings ADD COLUMN dtype TEXT NOT NULL DEFAULT 'float32'")
+            self.connection.execute("ALTER TABLE embeddings ADD COLUMN scale REAL")
+        if 'last_used' not in columns:
+            self.connection.execute("ALTER TABLE embeddings ADD COLUMN last_used REAL NOT NULL DEFAULT 0")
+        self.connection.execute("CREATE INDEX IF NOT EXISTS ix_embeddings_last_used ON embeddings (last_used)")
+        band_columns = ', '.join(f"band{band} INTEGER NOT NULL" for band in range(SIMHASH_BANDS))
+        self.connection.execute(
+            f"CREATE TABLE IF NOT EXISTS simhashes "
+            f"(hash BLOB PRIMARY KEY, model TEXT NOT NULL, simhash INTEGER NOT NULL, {band_columns})"
+        )
+        for band in range(SIMHASH_BANDS):
+            self.connection.execute(
+                f"CREATE INDEX IF NOT EXISTS ix_simhashes_band{band} ON simhashes (band{band})"
+            )
+        self.connection.commit()
+        self.hits = 0
+        self.near_hits = 0
+        self.misses = 0
+
+    def __getattr__(self, name: str) -> Any:
+        # Expose the wrapped encoder's attributes (name, score_threshold, ...)
+        if name == 'encoder':
+            raise AttributeError(name)
+        return getattr(self.encoder, name)
+
+    def hash_text(self, text: str) -> bytes:
+        """Hash a normalized text together with the model name"""
+        return hashlib.sha256(f"{self.model_name}|{text}".encode()).digest()
+
+    def find_near_duplicate(self, value: int) -> bytes | None:
+        """
+        Find the cached text whose SimHash is closest to value
+
+        Args:
+            value: SimHash of the text being looked up
+
+        Returns:
+            hash of the closest cached text within max_hamming_distance, or None
+        """
+        bands = simhash_bands(value)
+        candidates = self.connection.execute(
+            f"SELECT hash, simhash FROM simhashes WHERE model = ? AND ("
+            f"{' OR '.join(f'band{band} = ?' for band in range(SIMHASH_BANDS))})",
+            [self.model_name, *bands]
+        )
+        best_key, best_distance = None, self.max_hamming_distance + 1
+        for key, candidate in candidates:
+            distance = ((candidate & ((1 << SIMHASH_BITS) - 1)) ^ value).bit_count()
+            if distance < best_distance:
+                best_key, best_distance = key, distance
+        return best_key
+
+    def lookup(self, keys: list[bytes]) -> dict[bytes, list[float]]:
+        """
+        Fetch cached vectors for the given hashes and mark them as recently used
+
+        Args:
+            keys: Content hashes to look up
+
+        Returns:
+            dict mapping each cached hash to its vector
+        """
+        found = {}
+        for i in range(0, len(keys), self.LOOKUP_BATCH_SIZE):
+            batch = keys[i:i + self.LOOKUP_BATCH_SIZE]
+            rows = self.connection.execute(
+                f"SELECT hash, vec, dtype, scale FROM embeddings WHERE hash IN ({', '.join('?' * len(batch))})",
+                batch
+            )
+            for key, vec, dtype, scale in rows:
+                found[key] = dequantize(vec, dtype, scale)
+        if found:
+            now = time.time()
+            self.connection.executemany(
+                "UPDATE embeddings SET last_used = ? WHERE hash = ?",
+                [(now, key) for key in found]
+            )
+            self.connection.commit()
+        return found
+
+    def store(
+        self,
+        keys: list[bytes],
+        embeddings: list[list[float]],
+        simhashes: list[int] | None = None
+    ) -> None:
+        """
+        Write vectors and their SimHashes to the cache
+
+        Args:
+            keys: Content hashes
+            embeddings: Vectors matching the hashes
+            simhashes: SimHashes of the normalized texts, or None for vectors that were
+                not encoded from these texts so they never seed further near-duplicates
+        """
+        now = time.time()
+        rows = []
+        for key, embedding in zip(keys, embeddings):
+            blob, scale = quantize(embedding, self.dtype)
+            rows.append((key, blob, self.dtype, scale, now))
+        self.connection.executemany(
+            "INSERT OR REPLACE INTO embeddings (hash, vec, dtype, scale, last_used) VALUES (?, ?, ?, ?, ?)",
+            rows
+        )
+        if simhashes is not None:
+            self.connection.executemany(
+                f"INSERT OR REPLACE INTO simhashes VALUES (?, ?, ?, {', '.join('?' * SIMHASH_BANDS)})",
+                [
+                    (key, self.model_name, to_signed(value), *simhash_bands(value))
+                    for key, value in zip(keys, simhashes)
+                ]
+            )
+        self.evict()
+        self.connection.commit()
+
+    def evict(self) -> None:
+        """Delete the least recently used vectors beyond max_entries"""
+        if self.max_entries is None:
+            return
+        excess = self.connection.execute("SELECT COUNT(*) FROM embeddings").fetchone()[0] - self.max_entries
+        if excess <= 0:
+            return
+        evicted = self.connection.execute(
+            "SELECT hash FROM embeddings ORDER BY last_used LIMIT ?", (excess,)
+        ).fetchall()
+        self.connection.executemany("DELETE FROM embeddings WHERE hash = ?", evicted)
+        self.connection.executemany("DELETE FROM simhashes WHERE hash = ?", evicted)
+        logger.debug(f"Embedding cache: evicted {len(evicted)} least recently used vectors")
+
+    def __call__(self, docs: list[str], near_duplicates: bool = True) -> list[list[float]]:
+        """
+        Embed documents, calling the wrapped encoder only for cache misses
+
+        Args:
+            docs: List of document strings to embed
+            near_duplicates: Whether near-duplicate vectors may be reused; turn off
+                for short texts such as queries, where a few bits can flip the meaning
+
+        Returns:
+            list of embeddings in the same order as docs
+        """
+        normalized = [clean_text(doc) for doc in docs]
+        keys = [self.hash_text(text) for text in normalized]
+        cached = self.lookup(list(dict.fromkeys(keys)))
+
+        # First occurrence of every uncached text
+        missing = {}
+        for i, key in enumerate(keys):
+            if key not in cached:
+                missing.setdefault(key, i)
+        simhashes = {key: simhash(normalized[i]) for key, i in missing.items()}
+
+        near_hits = 0
+        if near_duplicates and self.max_hamming_distance is not None and missing:
+            near_keys = {}
+            for key in missing:
+                near_key = self.find_near_duplicate(simhashes[key])
+                if near_key is not None:
+                    near_keys[key] = near_key
+            near_vectors = self.lookup(list(set(near_keys.values())))
+            reused = [key for key, near_key in near_keys.items() if near_key in near_vectors]
+            for key in reused:
+                cached[key] = near_vectors[near_keys[key]]
+                del missing[key]
+            if reused:
+                # No SimHash row: distances stay measured against texts that were actually encoded
+                self.store(reused, [cached[key] for key in reused])
+            reused = set(reused)
+            near_hits = sum(1 for key in keys if key in reused)
+
+        if missing:
+            missing_keys = list(missing)
+            embeddings = self.encoder([docs[i] for i in missing.values()])
+            self.store(missing_keys, embeddings, [simhashes[key] for key in missing_keys])
+            cached.update(zip(missing_keys, embeddings))
+
+        misses = sum(1 for key in keys if key in missing)
+        self.hits += len(docs) - misses - near_hits
+        self.near_hits += near_hits
+        self.misses += misses
+        logger.debug(
+            f"Embedding cache: {len(docs) - misses - near_hits} hits, "
+            f"{near_hits} near-duplicate hits, {misses} misses"
+        )
+
+        return [cached[key] for key in keys]
+
+    def close(self) -> None:
+        """Close the cache database"""
+        self.connection.close()
@@ -1,10 +1,9 @@
-from sqlalchemy.orm import relationship, DeclarativeBase,Session
-from sqlalchemy import Column, DateTime, MetaData, event, text, String, Text, Table, Index, ForeignKey,Integer,Float
+from sqlalchemy.orm import relationship, DeclarativeBase,Session, selectinload
+from sqlalchemy import Column, DateTime, MetaData, func, select, String, Text, Table, Index, ForeignKey,Integer,Float
 from typing import Any
-from datetime import datetime
+import orjson
 import uuid 
 from sqlalchemy.orm import foreign, remote
-from sqlalchemy import Uuid as UUID
 
 
 convention = {
@@ -24,29 +23,21 @@ class Base(DeclarativeBase):
     
     __abstract__ = True
     
-    id = Column(UUID(), primary_key=True, default=uuid.uuid4)
-    date_created = Column(DateTime, server_default=text("CURRENT_TIMESTAMP"))
-    date_modified = Column(DateTime, nullable=True)
+    # Integer PK aliases the SQLite rowid; public_id is the stable external identifier
+    id = Column(Integer, primary_key=True, autoincrement=True)
+    public_id = Column(String(36), unique=True, nullable=False, default=lambda: str(uuid.uuid4()))
+    # Timestamps are filled in by the database so bulk Core inserts get them too
+    date_created = Column(DateTime, server_default=func.now())
+    date_modified = Column(DateTime, nullable=True, server_default=func.now(), onupdate=func.now())
     deleted_at = Column(DateTime, nullable=True)
 
-# Event listeners for automatic timestamp updates
-@event.listens_for(Base, "before_insert", propagate=True)
-def set_date_created(mapper, connection, target):
-    target.date_created = datetime.now()
-    if target.date_modified is None:
-        target.date_modified = datetime.now()
-
-@event.listens_for(Base, "before_update", propagate=True)
-def set_date_modified(mapper, connection, target):
-    target.date_modified = datetime.now()
-
 
 # Association tables with indexes for faster joins
 paper_authors = Table(
     'paper_authors',
     Base.metadata,
-    Column('paper_id', UUID(), ForeignKey('papers.id'), nullable=False),
-    Column('author_id', UUID(), ForeignKey('authors.id'), nullable=False),
+    Column('paper_id', Integer, ForeignKey('papers.id'), nullable=False),
+    Column('author_id', Integer, ForeignKey('authors.id'), nullable=False),
     Index('ix_paper_authors_paper_id', 'paper_id'),  
     Index('ix_paper_authors_author_id', 'author_id')  
 )
@@ -54,8 +45,8 @@ paper_authors = Table(
 paper_categories = Table(
     'paper_categories',
     Base.metadata,
-    Column('paper_id', UUID(), ForeignKey('papers.id'), nullable=False),
-    Column('category_id', UUID(), ForeignKey('categories.id'), nullable=False),
+    Column('paper_id', Integer, ForeignKey('papers.id'), nullable=False),
+    Column('category_id', Integer, ForeignKey('categories.id'), nullable=False),
     Index('ix_paper_categories_paper_id', 'paper_id'),
     Index('ix_paper_categories_category_id', 'category_id')
 )
@@ -63,8 +54,8 @@ paper_categories = Table(
 paper_references = Table(
     'paper_references',
     Base.metadata,
-    Column('citing_paper_id', UUID(), ForeignKey('papers.id'), nullable=False),
-    Column('cited_paper_id', UUID(), ForeignKey('papers.id'), nullable=False),
+    Column('citing_paper_id', Integer, ForeignKey('papers.id'), nullable=False),
+    Column('cited_paper_id', Integer, ForeignKey('papers.id'), nullable=False),
     Index('ix_paper_references_citing_id', 'citing_paper_id'),
     Index('ix_paper_references_cited_id', 'cited_paper_id')
 )
@@ -86,21 +77,22 @@ class Paper(Base):
     total_tokens = Column(Integer)
     chunk_count = Column(Integer)
     
-    published = Column(String(8), nullable=False, index=True)
-    updated = Column(String(8), nullable=False, index=True)
+    # YYYYMMDD stored as an integer for smaller indexes and cheaper range comparisons
+    published = Column(Integer, nullable=False, index=True)
+    updated = Column(Integer, nullable=False, index=True)
 
     authors = relationship(
         "Author",
         secondary=paper_authors,
         back_populates="papers",
-        lazy='joined'
+        lazy='select'
     )
     
     categories = relationship(
         "Category",
         secondary=paper_categories,
         back_populates="papers",
-        lazy='joined'
+        lazy='select'
     )
 
     citations = relationship(
@@ -122,6 +114,37 @@ class Paper(Base):
         if cited_paper:
             self.citations.append(cited_paper)
 
+    @classmethod
+    def serialize_batch(
+        cls,
+        session: Session,
+        paper_ids: list[int],
+        include_citations: bool = True
+    ) -> list[dict[str, Any]]:
+        """
+        Serialize many papers with their relationships preloaded.
+        Each relationship is fetched with one selectinload query for the whole batch
+        instead of one lazy load per paper.
+        Args:
+            session: SQLAlchemy session
+            paper_ids: Primary keys of the papers to serialize
+            include_citations: Whether to include citation data
+        """
+        options = [selectinload(cls.authors), selectinload(cls.categories)]
+        if include_citations:
+            options += [selectinload(cls.citations), selectinload(cls.cited_by)]
+
+        papers = session.execute(
+            select(cls).options(*options).where(cls.id.in_(paper_ids))
+        ).scalars().all()
+        papers_by_id = {paper.id: paper for paper in papers}
+
+        return [
+            papers_by_id[paper_id].to_dict(include_citations=include_citations)
+            for paper_id in paper_ids
+            if paper_id in papers_by_id
+        ]
+
     def to_dict(self, include_citations: bool = True) -> dict[str, Any]:
         """
         Convert paper to dictionary representation.
@@ -130,7 +153,8 @@ class Paper(Base):
             include_chunks: Whether to include chunk data
         """
         data = {
-            "id": str(self.id),
+            "id": self.id,
+            "public_id": self.public_id,
             "arxiv_id": self.arxiv_id,
             "title": self.title,
             "summary": self.summary,
@@ -157,11 +181,47 @@ class Paper(Base):
         
         return data
 
+    def to_json_bytes(self, include_citations: bool = True) -> bytes:
+        """
+        Serialize paper straight to JSON bytes with orjson.
+        Datetimes are passed through as-is (stored as UTC) and authors/categories are
+        flattened to names/codes, avoiding the nested to_dict() allocations. Prefer
+        this over to_dict() when returning papers from an API.
+        Args:
+            include_citations: Whether to include citation data
+        """
+        data = {
+            "id": self.id,
+            "public_id": self.public_id,
+            "arxiv_id": self.arxiv_id,
+            "title": self.title,
+            "summary": self.summary,
+            "content": self.content,
+            "source": self.source,
+            "comment": self.comment,
+            "journal_ref": self.journal_ref,
+            "primary_category": self.primary_category,
+            "published": self.published,
+            "updated": self.updated,
+            "total_tokens": self.total_tokens,
+            "chunk_count": self.chunk_count,
+            "authors": [author.name for author in self.authors],
+            "categories": [category.code for category in self.categories],
+            "date_created": self.date_created,
+            "date_modified": self.date_modified
+        }
+
+        if include_citations:
+            data["citations"] = [cited.arxiv_id for cited in self.citations]
+            data["cited_by"] = [citing.arxiv_id for citing in self.cited_by]
+
+        return orjson.dumps(data, option=orjson.OPT_NAIVE_UTC)
+
 class Author(Base):
 
     __tablename__ = 'authors'
 
-    name = Column(String(255), nullable=False, index=True)  # Indexed for name searches
+    name = Column(String(255), nullable=False, unique=True, index=True)  # Unique so inserts can skip existing authors
     
     email = Column(String(255), unique=True, index=True)  
     institution = Column(String(255), index=True)        
@@ -184,7 +244,8 @@ class Author(Base):
             include_papers: Whether to include paper data
         """
         data = {
-            "id": str(self.id),
+            "id": self.id,
+            "public_id": self.public_id,
             "name": self.name,
             "email": self.email,
             "institution": self.institution,
@@ -194,7 +255,7 @@ class Author(Base):
         
         if include_papers:
             data["papers"] = [
-                {"id": str(paper.id), "title": paper.title, "arxiv_id": paper.arxiv_id}
+                {"id": paper.id, "public_id": paper.public_id, "title": paper.title, "arxiv_id": paper.arxiv_id}
                 for paper in self.papers
             ]
         
@@ -226,7 +287,8 @@ class Category(Base):
             include_papers: Whether to include paper data
         """
         data = {
-            "id": str(self.id),
+            "id": self.id,
+            "public_id": self.public_id,
             "code": self.code,
             "name": self.name,
             "description": self.description,
@@ -236,7 +298,7 @@ class Category(Base):
         
         if include_papers:
             data["papers"] = [
-                {"id": str(paper.id), "title": paper.title, "arxiv_id": paper.arxiv_id}
+                {"id": paper.id, "public_id": paper.public_id, "title": paper.title, "arxiv_id": paper.arxiv_id}
                 for paper in self.papers
             ]
         
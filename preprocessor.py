@@ -1,6 +1,7 @@
 
 
-from typing import Any
+from typing import Any, NamedTuple
+from dataclasses import dataclass
 import re
 import logging
 import unicodedata
@@ -14,6 +15,16 @@ from data_loading import get_or_create_database
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
+# Compiled once at import instead of on every clean_text call
+_CLEAN_RE = re.compile(r'[^\w\s.,!?;:()\[\]{}"\'`-]')
+_WS_RE = re.compile(r'\s+')
+
+def clean_text(text: str) -> str:
+    """Normalize unicode, drop unusual symbols and collapse whitespace"""
+    if not text:
+        return ""
+    return _WS_RE.sub(' ', _CLEAN_RE.sub(' ', unicodedata.normalize('NFKC', text))).strip()
+
 class StatisticalChunkerWrapper:
     """
     Wrapper class to make StatisticalChunker output consistent format
@@ -83,6 +94,56 @@ class RollingWindowWrapper:
         return all_chunks
     
 
+class PaperPayload(NamedTuple):
+    """
+    Plain snapshot of the Paper fields needed for chunking, safe to send to worker processes
+    """
+    arxiv_id: str
+    title: str
+    summary: str
+    content: str
+    citations: list[str]
+
+    @classmethod
+    def from_paper(cls, paper: Paper) -> "PaperPayload":
+        return cls(
+            arxiv_id=paper.arxiv_id,
+            title=paper.title,
+            summary=paper.summary,
+            content=paper.content,
+            citations=[cited.arxiv_id for cited in paper.citations]
+        )
+
+@dataclass(slots=True)
+class ChunkMeta:
+    """
+    Metadata of a single chunk, carried from chunking through to the vector upsert
+    """
+    id: str
+    title: str
+    content: str
+    embed_text: str
+    prechunk_id: str
+    postchunk_id: str
+    arxiv_id: str
+    references: list[str]
+    chunk_index: int
+    token_count: int | None
+    semantic_score: float
+
+    def to_pinecone_metadata(self) -> dict[str, Any]:
+        """Build the metadata dict stored alongside the vector in Pinecone"""
+        return {
+            'title': self.title,
+            'content': self.content,
+            'prechunk_id': self.prechunk_id,
+            'postchunk_id': self.postchunk_id,
+            'arxiv_id': self.arxiv_id,
+            'references': self.references,
+            'chunk_index': self.chunk_index,
+            'token_count': self.token_count,
+        }
+
 class ArXivPreprocessor:
     def __init__(self, encoder,speed=0):
         if speed == 0:
@@ -95,27 +156,28 @@ class ArXivPreprocessor:
                 window_size=2
             )
     def clean_text(self, text: str) -> str:
-        if not text:
-            return ""
-        text = unicodedata.normalize('NFKC', text)
-        text = re.sub(r'[^\w\s.,!?;:()\[\]{}"\'`-]', ' ', text)
-        return ' '.join(text.split()).strip()
+        return clean_text(text)
 
     def build_chunk_metadata(
         self,
-        paper: Paper,
+        paper: PaperPayload,
         chunks: list[dict],
-    ) -> list[dict[str, Any]]:
+        references: list[str] | None = None
+    ) -> list[ChunkMeta]:
         """
         Build metadata for document chunks
         
         Args:
-            paper: Paper model instance
+            paper: Paper snapshot
             chunks: list of chunks from StatisticalChunker
+            references: arXiv ids cited by the paper, defaults to paper.citations
         
         Returns:
-            list of chunk metadata dictionaries
+            list of chunk metadata
         """
+        if references is None:
+            references = list(paper.citations)
+
         metadata = []
         for i, chunk in enumerate(chunks):
             #print
@@ -123,18 +185,19 @@ class ArXivPreprocessor:
             prechunk_id = "" if i == 0 else f"{paper.arxiv_id}#{i-1}"
             postchunk_id = "" if i+1 == len(chunks) else f"{paper.arxiv_id}#{i+1}"
             
-            metadata.append({
-                "id": f"{paper.arxiv_id}#{i}",
-                "title": paper.title,
-                "content": chunk['text'],
-                "prechunk_id": prechunk_id,
-                "postchunk_id": postchunk_id,
-                "arxiv_id": paper.arxiv_id,
-                "references": [cited.arxiv_id for cited in paper.citations],
-                "chunk_index": i,
-                "token_count": chunk.get('token_count'),
-                "semantic_score": chunk.get('score', 0.0)
-            })
+            metadata.append(ChunkMeta(
+                id=f"{paper.arxiv_id}#{i}",
+                title=paper.title,
+                content=chunk['text'],
+                embed_text=self.build_chunk_content(paper.title, chunk['text']),
+                prechunk_id=prechunk_id,
+                postchunk_id=postchunk_id,
+                arxiv_id=paper.arxiv_id,
+                references=references,
+                chunk_index=i,
+                token_count=chunk.get('token_count'),
+                semantic_score=chunk.get('score', 0.0)
+            ))
         
         return metadata
 
@@ -142,46 +205,43 @@ class ArXivPreprocessor:
         """Build content with title prefix"""
         return f"# {title}\n{content}"
 
-    def preprocess_paper(self, paper: Paper) -> list[dict] | None :
+    def preprocess_paper(self, paper: PaperPayload | Paper) -> list[ChunkMeta] | None :
         """
-        Preprocess a paper and update its content and metadata
+        Preprocess a paper into chunk metadata
+        
+        When given a Paper model instance its chunk_count and total_tokens are
+        updated as well; PaperPayload snapshots leave that to the caller.
         
         Args:
-            paper: Paper model instance
+            paper: Paper snapshot or Paper model instance
             
         Returns:
-            Optional[list[dict]]: List of chunk metadata if successful
+            Optional[list[ChunkMeta]]: List of chunk metadata if successful
         """
+        model = paper if isinstance(paper, Paper) else None
+        if model is not None:
+            paper = PaperPayload.from_paper(model)
+
         try:
             # Clean text fields
             if not paper.content:
                 logger.warning(f"No content for paper {paper.arxiv_id}, skipping preprocessing")
                 return None
             
-            title = self.clean_text(paper.title)
-            summary = self.clean_text(paper.summary)
             content = self.clean_text(paper.content)
             
 
             # Process content with semantic chunking
             chunks = self.chunker(docs=[content])
             # Build chunk metadata
-            chunks_metadata = self.build_chunk_metadata(paper, chunks)
-            
-            # Process chunks with titles and combine
-            processed_content = []
-            for chunk_meta in chunks_metadata:
-                chunk_content = self.build_chunk_content(
-                    title=title,
-                    content=chunk_meta['content']
-                )
-                processed_content.append(chunk_content)
+            chunks_metadata = self.build_chunk_metadata(paper, chunks, references=paper.citations)
             
             # Update paper with processed content and metadata
-            paper.chunk_count = len(chunks)
-            paper.total_tokens = sum(chunk['token_count'] for chunk in chunks_metadata)
+            if model is not None:
+                model.chunk_count = len(chunks)
+                model.total_tokens = sum(chunk.token_count for chunk in chunks_metadata)
             
-            logger.info(f"Successfully preprocessed paper {paper.arxiv_id} into {paper.chunk_count} chunks")
+            logger.info(f"Successfully preprocessed paper {paper.arxiv_id} into {len(chunks)} chunks")
             
             return chunks_metadata
             
@@ -189,3 +249,14 @@ class ArXivPreprocessor:
             logger.error(f"Error preprocessing paper {paper.arxiv_id}: {e}")
             raise
 
+# Preprocessor of the current worker process, set once by init_chunk_worker
+_worker_preprocessor: ArXivPreprocessor | None = None
+
+def init_chunk_worker(preprocessor: ArXivPreprocessor) -> None:
+    """Process pool initializer storing the preprocessor for chunk_worker"""
+    global _worker_preprocessor
+    _worker_preprocessor = preprocessor
+
+def chunk_worker(payload: PaperPayload) -> list[ChunkMeta] | None:
+    """Chunk a single paper inside a worker process"""
+    return _worker_preprocessor.preprocess_paper(payload)
@@ -18,14 +18,21 @@ class RAGAgent:
         temperature: float = 0,
         verbose: bool = True,
         max_iterations: int = 3,
-        chat_history: list = []
+        chat_history: list | None = None,
+        max_history_messages: int = 20
     ):
+        # History is kept as Human/AI pairs, so an odd cap would start it on an AIMessage
+        if max_history_messages < 0 or max_history_messages % 2:
+            raise ValueError("max_history_messages must be a non-negative even number")
         
         self.llm = ChatOpenAI(model=model, temperature=temperature)
 
         self.vectorizer = vectorizer
 
-        self.chat_history = chat_history
+        # Copy so agents never share (or mutate) the caller's list
+        self.chat_history = list(chat_history) if chat_history else []
+        # Only the most recent messages are sent with each query to bound prompt size
+        self.max_history_messages = max_history_messages
         self.tools = tools                 
 
         self.prompt = prompt
@@ -78,6 +85,10 @@ class RAGAgent:
                 HumanMessage(content=user_input),
                 AIMessage(content=result["output"]),
             ])
+            # Slicing with [-0:] would keep everything, so 0 disables history explicitly
+            self.chat_history = (
+                self.chat_history[-self.max_history_messages:] if self.max_history_messages else []
+            )
             
             return result["output"]
         except Exception as e:
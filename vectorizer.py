@@ -1,23 +1,44 @@
 from typing import Any, Generator
+import os
+import pickle
+from concurrent.futures import FIRST_COMPLETED, Executor, Future, ProcessPoolExecutor, ThreadPoolExecutor, wait
+from concurrent.futures.process import BrokenProcessPool
+from contextlib import nullcontext
+import numpy as np
 from tqdm.auto import tqdm
 import logging
-from datetime import datetime
+import time
 from models import Paper
-from preprocessor import ArXivPreprocessor
+from embedding_cache import CachedEncoder
+from preprocessor import ArXivPreprocessor, ChunkMeta, PaperPayload, chunk_worker, init_chunk_worker
 from data_loading import get_or_create_database
-from sqlalchemy.orm import Session 
+from sqlalchemy import update
+from sqlalchemy.orm import Session, selectinload
 
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
 class Vectorizer:
     """Handles document vectorization and vector storage"""
+
+    # Upper token bounds of the length buckets encoded together; longer texts share a last bucket
+    LENGTH_BUCKETS = (64, 128, 256, 512)
+    # Each encode batch is upserted in the background while the next one encodes;
+    # cap how many encoded batches may wait on Pinecone at once
+    UPSERT_WORKERS = 2
+    MAX_PENDING_UPSERTS = 2
     
     def __init__(
         self,
         encoder, 
         index,  
-        batch_size: int = 5
+        batch_size: int = 5,
+        encode_batch_size: int = 128,
+        cache_path: str | None = None,
+        cache_dtype: str = 'float32',
+        include_title_in_embed: bool = True,
+        pool_title: bool = False,
+        bucket_by_length: bool = False
     ):
         """
         Initialize vectorizer with encoder and storage
@@ -25,85 +46,251 @@ class Vectorizer:
         Args:
             encoder: Model for generating embeddings
             index: Pinecone index for vector storage
-            batch_size: Size of batches for processing
+            batch_size: Number of vectors per Pinecone upsert
+            encode_batch_size: Number of texts sent to the encoder per call
+            cache_path: Optional SQLite file for caching embeddings across runs
+            cache_dtype: Storage format of cached embeddings (float32, float16 or int8)
+            include_title_in_embed: Whether the paper title contributes to chunk embeddings;
+                when False only the chunk content is encoded (the title stays in metadata)
+            pool_title: Encode each title once per paper and average its normalized vector
+                with the content vector, instead of prefixing the title to every chunk
+            bucket_by_length: Split each encode batch into calls of similar-length texts.
+                Only helps local models that pad a batch to its longest text; remote
+                encoders such as OpenAIEncoder bill per token, so this just adds calls.
         """
-        self.encoder = encoder
+        self.encoder = CachedEncoder(encoder, cache_path=cache_path, dtype=cache_dtype) if cache_path else encoder
         self.index = index
         self.batch_size = batch_size
+        self.encode_batch_size = encode_batch_size
+        self.include_title_in_embed = include_title_in_embed
+        self.pool_title = pool_title
+        self.bucket_by_length = bucket_by_length
+        # Shared across vectorize_and_store calls so upserts overlap with the next call's encoding
+        self.upsert_executor = ThreadPoolExecutor(max_workers=self.UPSERT_WORKERS)
+        # Pending upsert futures mapped to the number of chunks they carry
+        self.pending_upserts: dict[Future, int] = {}
 
-    def build_chunk(self, title: str, content: str) -> str:
-        """Build chunk content with title prefix"""
-        return f"# {title}\n{content}"
+    def encode_bucketed(
+        self,
+        texts: list[str],
+        token_counts: list[int | None]
+    ) -> list[list[float]]:
+        """
+        Encode texts, grouped by length when bucket_by_length is set so each
+        encoder call pads to a similar length
+        
+        Args:
+            texts: Texts to encode
+            token_counts: Approximate token count of each text
+        
+        Returns:
+            list of embeddings in the same order as texts
+        """
+        if not self.bucket_by_length:
+            return list(self.encoder(texts))
+
+        lengths = np.array([count or 0 for count in token_counts])
+        order = np.argsort(lengths, kind="stable")
+        buckets = np.searchsorted(self.LENGTH_BUCKETS, lengths[order])
+
+        embeddings: list[list[float] | None] = [None] * len(texts)
+        # Split the sorted positions wherever the bucket changes
+        for group in np.split(order, np.flatnonzero(np.diff(buckets)) + 1):
+            if len(group) == 0:
+                continue
+            for position, embedding in zip(group, self.encoder([texts[i] for i in group])):
+                embeddings[position] = embedding
+        return embeddings
+
+    def pool_title_embeddings(
+        self,
+        batch: list[ChunkMeta],
+        embeddings: list[list[float]],
+        title_vectors: dict[str, np.ndarray]
+    ) -> list[list[float]]:
+        """
+        Combine content embeddings with their paper's title embedding
+        
+        Args:
+            batch: Chunks the embeddings belong to
+            embeddings: Content-only embeddings of the chunks
+            title_vectors: Normalized title vectors by arxiv_id, filled in for new papers
+        
+        Returns:
+            list of normalized averages of title and content vectors
+        """
+        titles = {item.arxiv_id: item.title for item in batch if item.arxiv_id not in title_vectors}
+        if titles:
+            for arxiv_id, vector in zip(titles, self.encoder(list(titles.values()))):
+                vector = np.asarray(vector, dtype=np.float32)
+                title_vectors[arxiv_id] = vector / max(np.linalg.norm(vector), 1e-12)
+
+        content = np.asarray(embeddings, dtype=np.float32)
+        content /= np.maximum(np.linalg.norm(content, axis=1, keepdims=True), 1e-12)
+        pooled = content + np.stack([title_vectors[item.arxiv_id] for item in batch])
+        pooled /= np.maximum(np.linalg.norm(pooled, axis=1, keepdims=True), 1e-12)
+        return pooled.tolist()
 
     def batch_generator(
         self,
-        metadata_list: list[dict[str, Any]]
-    ) -> Generator[list[dict[str, Any]], None, None]:
-        """Generate batches of metadata for processing"""
-        for i in range(0, len(metadata_list), self.batch_size):
-            yield metadata_list[i:i + self.batch_size]
+        metadata_list: list[Any],
+        batch_size: int | None = None
+    ) -> Generator[list[Any], None, None]:
+        """Generate batches of metadata for processing (defaults to the upsert batch size)"""
+        batch_size = batch_size or self.batch_size
+        for i in range(0, len(metadata_list), batch_size):
+            yield metadata_list[i:i + batch_size]
+
+    def upsert_chunks(
+        self,
+        batch: list[ChunkMeta],
+        embeddings: list[list[float]]
+    ) -> tuple[int, int]:
+        """
+        Upsert an encoded batch to Pinecone in batch_size slices
+        
+        Runs on the upsert executor; a failed slice does not stop the rest.
+        
+        Args:
+            batch: Chunks of one encode batch
+            embeddings: Embeddings of the chunks
+        
+        Returns:
+            tuple of (processed, failed) chunk counts
+        """
+        processed = 0
+        failed = 0
+        for start in range(0, len(batch), self.batch_size):
+            upsert_batch = batch[start:start + self.batch_size]
+            try:
+                # Prepare metadata - convert to dict format expected by Pinecone
+                metadata_batch = [item.to_pinecone_metadata() for item in upsert_batch]
+                
+                # Store in vector database
+                vectors_to_upsert = list(zip(
+                    [item.id for item in upsert_batch],
+                    embeddings[start:start + self.batch_size],
+                    metadata_batch  
+                ))
+                
+                self.index.upsert(vectors=vectors_to_upsert)
+                processed += len(upsert_batch)
+                
+            except Exception as e:
+                logger.error("Error upserting batch: %s", e)
+                failed += len(upsert_batch)
+        return processed, failed
+
+    def collect_upserts(self, futures) -> tuple[int, int]:
+        """
+        Remove finished upsert futures from the pending set and total their results
+        
+        Args:
+            futures: Finished futures returned by upsert_chunks
+        
+        Returns:
+            tuple of (processed, failed) chunk counts
+        """
+        processed = 0
+        failed = 0
+        for future in futures:
+            count = self.pending_upserts.pop(future)
+            try:
+                batch_processed, batch_failed = future.result()
+            except Exception as e:
+                logger.error("Error upserting batch: %s", e)
+                batch_processed, batch_failed = 0, count
+            processed += batch_processed
+            failed += batch_failed
+        return processed, failed
+
+    def wait_for_upserts(self) -> tuple[int, int]:
+        """
+        Block until every pending upsert has finished
+        
+        Returns:
+            tuple of (processed, failed) chunk counts of the drained upserts
+        """
+        done, _ = wait(self.pending_upserts)
+        return self.collect_upserts(done)
 
     def vectorize_and_store(
         self,
-        metadata_list: list[dict[str, Any]],
-        show_progress: bool = True
+        metadata_list: list[ChunkMeta],
+        show_progress: bool = True,
+        drain: bool = True
     ) -> dict[str, Any]:
         """
         Vectorize documents and store in vector database
+        
+        Args:
+            metadata_list: Chunks to encode and upsert
+            show_progress: Whether to show a progress bar
+            drain: Wait for every upsert before returning. When False the last upserts
+                keep running while the caller prepares more chunks; call wait_for_upserts
+                once done. The stats then count upserts as they finish, in whichever
+                call collects them.
+        
+        Returns:
+            dict of vectorization statistics
         """
         try:
-            start_time = datetime.now()
+            start_time = time.perf_counter()
             total_chunks = len(metadata_list)
             processed_chunks = 0
             failed_chunks = 0
 
-            # Process in batches
-            batches = list(self.batch_generator(metadata_list))
+            # Encode in large batches to keep the encoder busy, upsert in Pinecone-sized slices
+            total_batches = (total_chunks + self.encode_batch_size - 1) // self.encode_batch_size
+
+            # Title vectors of papers seen so far when pooling titles
+            title_vectors: dict[str, np.ndarray] = {}
+            prefix_title = self.include_title_in_embed and not self.pool_title
             
-            for batch in tqdm(batches, disable=not show_progress):
+            for batch in tqdm(
+                self.batch_generator(metadata_list, self.encode_batch_size),
+                total=total_batches,
+                disable=not show_progress
+            ):
                 try:
-                    # Prepare batch data
-                    ids = [item["id"] for item in batch]
-                    texts = [
-                        self.build_chunk(
-                            title=item["title"],
-                            content=item["content"]
-                        )
-                        for item in batch
-                    ]
+                    # Encode each distinct text once; repeated boilerplate shares its embedding
+                    unique_positions: dict[str, int] = {}
+                    token_counts = []
+                    inverse = []
+                    for item in batch:
+                        text = item.embed_text if prefix_title else item.content
+                        if text not in unique_positions:
+                            unique_positions[text] = len(unique_positions)
+                            token_counts.append(item.token_count)
+                        inverse.append(unique_positions[text])
                     
                     # Generate embeddings
-                    embeddings = self.encoder(texts)
-                    
-                    # Prepare metadata - convert to dict format expected by Pinecone
-                    metadata_batch = [{
-                        'title': item['title'],
-                        'content': item['content'],
-                        'prechunk_id': item['prechunk_id'],
-                        'postchunk_id': item['postchunk_id'],
-                        'arxiv_id': item['arxiv_id'],
-                        'references': item['references'],
-                        'chunk_index': item['chunk_index'],
-                        'token_count': item['token_count'],
-                    } for item in batch]
-                    
-                    # Store in vector database
-                    vectors_to_upsert = list(zip(
-                        ids,
-                        embeddings,
-                        metadata_batch  
-                    ))
-                    
-                    self.index.upsert(vectors=vectors_to_upsert)
-                    
-                    processed_chunks += len(batch)
+                    unique_embeddings = self.encode_bucketed(list(unique_positions), token_counts)
+                    embeddings = [unique_embeddings[position] for position in inverse]
+                    if self.include_title_in_embed and self.pool_title:
+                        embeddings = self.pool_title_embeddings(batch, embeddings, title_vectors)
                     
                 except Exception as e:
-                    logger.error(f"Error processing batch: {str(e)}")
+                    logger.error("Error encoding batch: %s", e)
                     failed_chunks += len(batch)
+                    continue
+
+                # Block only when too many encoded batches are already waiting on Pinecone
+                if len(self.pending_upserts) >= self.MAX_PENDING_UPSERTS:
+                    done, _ = wait(self.pending_upserts, return_when=FIRST_COMPLETED)
+                    batch_processed, batch_failed = self.collect_upserts(done)
+                    processed_chunks += batch_processed
+                    failed_chunks += batch_failed
+
+                future = self.upsert_executor.submit(self.upsert_chunks, batch, embeddings)
+                self.pending_upserts[future] = len(batch)
 
-            end_time = datetime.now()
-            duration = (end_time - start_time).total_seconds()
+            if drain:
+                batch_processed, batch_failed = self.wait_for_upserts()
+                processed_chunks += batch_processed
+                failed_chunks += batch_failed
+
+            duration = time.perf_counter() - start_time
 
             stats = {
                 "total_chunks": total_chunks,
@@ -114,17 +301,18 @@ class Vectorizer:
             }
 
             logger.info(
-                f"Vectorization completed:\n"
-                f"- Processed chunks: {processed_chunks}\n"
-                f"- Failed chunks: {failed_chunks}\n"
-                f"- Processing time: {duration:.2f} seconds\n"
-                f"- Rate: {stats['chunks_per_second']:.2f} chunks/second"
+                "Vectorization completed:\n"
+                "- Processed chunks: %d\n"
+                "- Failed chunks: %d\n"
+                "- Processing time: %.2f seconds\n"
+                "- Rate: %.2f chunks/second",
+                processed_chunks, failed_chunks, duration, stats['chunks_per_second']
             )
 
             return stats
 
         except Exception as e:
-            logger.error(f"Vectorization failed: {str(e)}")
+            logger.error("Vectorization failed: %s", e)
             raise
 
     def query(
@@ -146,7 +334,10 @@ class Vectorizer:
         """
         try:
             # Generate query embedding
-            query_embedding = self.encoder([text])[0]
+            if isinstance(self.encoder, CachedEncoder):
+                query_embedding = self.encoder([text], near_duplicates=False)[0]
+            else:
+                query_embedding = self.encoder([text])[0]
             
             # Query vector database
             results = self.index.query(
@@ -155,26 +346,35 @@ class Vectorizer:
                 include_metadata=True
             )
             
+            # Fetch all neighboring chunks of all matches in a single round trip
+            context_chunks = {}
+            if include_context:
+                context_ids = {
+                    chunk_id
+                    for match in results["matches"]
+                    for chunk_id in (match["metadata"]["prechunk_id"], match["metadata"]["postchunk_id"])
+                    if chunk_id
+                }
+                if context_ids:
+                    context_chunks = self.index.fetch(ids=list(context_ids))["vectors"]
+
             matches = []
             for match in results["matches"]:
                 content = match["metadata"]["content"]
                 title = match["metadata"]["title"]
                 
-                if include_context:
-                    # Fetch neighboring chunks
-                    pre_id = match["metadata"]["prechunk_id"]
-                    post_id = match["metadata"]["postchunk_id"]
+                if context_chunks:
+                    pre_chunk = context_chunks.get(match["metadata"]["prechunk_id"])
+                    post_chunk = context_chunks.get(match["metadata"]["postchunk_id"])
                     
-                    if pre_id or post_id:
-                        context_chunks = self.index.fetch(
-                            ids=[id for id in [pre_id, post_id] if id]
-                        )["vectors"]
-                        
-                        # Add context to content
-                        if pre_id and pre_id in context_chunks:
-                            content = f"{context_chunks[pre_id]['metadata']['content'][-400:]} {content}"
-                        if post_id and post_id in context_chunks:
-                            content = f"{content} {context_chunks[post_id]['metadata']['content'][:400]}"
+                    if pre_chunk or post_chunk:
+                        # Join the available context in a single allocation
+                        parts = [
+                            pre_chunk["metadata"]["content"][-400:] if pre_chunk else None,
+                            content,
+                            post_chunk["metadata"]["content"][:400] if post_chunk else None
+                        ]
+                        content = " ".join(part for part in parts if part is not None)
                 
                 matches.append({
                     "title": title,
@@ -195,48 +395,88 @@ def process_papers_batch(
     session: Session,
     preprocessor: ArXivPreprocessor,
     vectorizer: Vectorizer,
-    batch_size: int = 5
+    commit_every: int = 100,
+    executor: Executor | None = None
 ) -> None:
     """
     Process a batch of papers with preprocessing and optional vectorization
+    
+    Args:
+        papers: Papers to process
+        session: SQLAlchemy session the papers belong to
+        preprocessor: ArXivPreprocessor instance, used directly when no executor is given
+        vectorizer: Optional Vectorizer instance
+        commit_every: Number of papers between commits; the rest are committed at the end
+        executor: Optional process pool initialized with init_chunk_worker; chunking
+            then runs in parallel across papers while the session stays on this thread
     """
     total_papers = len(papers)
     successful = 0
     failed = 0
     
-    logger.info(f"Starting preprocessing of {total_papers} papers...")
-    start_time = datetime.now()
+    logger.info("Starting preprocessing of %d papers...", total_papers)
+    start_time = time.perf_counter()
     
     # Collect chunks for vectorization
     current_batch_chunks = []
+    # Chunk statistics written with one bulk UPDATE per commit instead of per-row flushes
+    paper_updates = []
+
+    # Only plain payloads cross the process boundary, never SQLAlchemy objects
+    payloads = [PaperPayload.from_paper(paper) for paper in papers]
+    futures = None
+    if executor:
+        try:
+            futures = [executor.submit(chunk_worker, payload) for payload in payloads]
+        except Exception as e:
+            # A broken or shut down pool should not fail the whole batch
+            logger.warning("Process pool unavailable, chunking in-process: %s", e)
     
-    for i, paper in enumerate(papers, 1):
+    for i, (paper, payload) in enumerate(zip(papers, payloads), 1):
         try:
-            chunks_metadata = preprocessor.preprocess_paper(paper)
+            if futures:
+                try:
+                    chunks_metadata = futures[i - 1].result()
+                except (BrokenProcessPool, pickle.PicklingError) as e:
+                    # Workers died or the preprocessor could not be sent to them
+                    logger.warning("Chunking %s in-process after pool error: %s", paper.arxiv_id, e)
+                    futures = None
+            if not futures:
+                chunks_metadata = preprocessor.preprocess_paper(payload)
             
             if chunks_metadata:
+                paper_updates.append({
+                    "id": paper.id,
+                    "chunk_count": len(chunks_metadata),
+                    "total_tokens": sum(chunk.token_count for chunk in chunks_metadata)
+                })
                 if vectorizer:
                     # chunks_metadata is already in the correct format for vectorization
                     current_batch_chunks.extend(chunks_metadata)
                 successful += 1
             
-            # Vectorize in batches if needed
-            if vectorizer and len(current_batch_chunks) >= batch_size:
+            # Vectorize once enough chunks have accumulated for a full encoder batch
+            if vectorizer and len(current_batch_chunks) >= vectorizer.encode_batch_size:
                 vectorizer.vectorize_and_store(
                     metadata_list=current_batch_chunks,
-                    show_progress=True
+                    show_progress=True,
+                    drain=False
                 )
                 current_batch_chunks = []
             
             # Commit database changes in batches
-            if i % batch_size == 0:
+            if i % commit_every == 0:
                 try:
+                    if paper_updates:
+                        session.execute(update(Paper), paper_updates)
                     session.commit()
-                    logger.info(f"Processed and committed {i}/{total_papers} papers...")
+                    logger.info("Processed and committed %d/%d papers...", i, total_papers)
                 except Exception as e:
                     session.rollback()
                     logger.error(f"Error committing batch ending at {i}: {str(e)}")
                     failed += 1
+                finally:
+                    paper_updates = []
                 
         except Exception as e:
             logger.error(f"Failed to process paper {paper.arxiv_id}: {e}")
@@ -247,33 +487,47 @@ def process_papers_batch(
     if vectorizer and current_batch_chunks:
         vectorizer.vectorize_and_store(
             metadata_list=current_batch_chunks,
-            show_progress=True
+            show_progress=True,
+            drain=False
         )
+
+    # Upserts overlap with chunking and encoding above; wait for them before the final commit
+    if vectorizer:
+        _, failed_chunks = vectorizer.wait_for_upserts()
+        if failed_chunks:
+            logger.error("Failed to upsert %d chunks", failed_chunks)
     
     # Commit any remaining papers
     try:
+        if paper_updates:
+            session.execute(update(Paper), paper_updates)
         session.commit()
     except Exception as e:
         session.rollback()
         logger.error(f"Error committing final batch: {str(e)}")
     
-    duration = (datetime.now() - start_time).total_seconds()
-    logger.info(f"""
-    Processing completed:
-    - Total papers: {total_papers}
-    - Successfully processed: {successful}
-    - Failed to process: {failed}
-    - Time taken: {duration:.2f} seconds
-    - Average rate: {total_papers/duration:.2f} papers/second
-    """)
+    duration = time.perf_counter() - start_time
+    if logger.isEnabledFor(logging.INFO):
+        logger.info(
+            "Processing completed:\n"
+            "- Total papers: %d\n"
+            "- Successfully processed: %d\n"
+            "- Failed to process: %d\n"
+            "- Time taken: %.2f seconds\n"
+            "- Average rate: %.2f papers/second",
+            total_papers, successful, failed, duration,
+            total_papers / duration if duration > 0 else 0
+        )
 
 def process_existing_papers(
     preprocessor: ArXivPreprocessor,
     vectorizer: Vectorizer,
     db_url: str = 'sqlite:///arxiv_papers.db',
-    batch_size: int = 5,
+    batch_size: int = 100,
     start_offset: int = 0,
     stop_at: int = 10,
+    max_workers: int | None = 1,
+    commit_every: int = 100,
 ) -> dict:
     """
     Process existing papers from database with preprocessing and optional vectorization
@@ -282,15 +536,18 @@ def process_existing_papers(
         preprocessor: ArXivPreprocessor instance
         vectorizer: Optional Vectorizer instance
         db_url: Database URL
-        batch_size: Size of batches for processing
-        start_offset: Starting offset for processing (useful for resuming)
+        batch_size: Number of papers loaded per query; each batch ends with a commit
+        start_offset: Number of papers (in id order) to skip, useful for resuming
+        max_workers: Processes used for chunking; 1 (the default) chunks in-process and None uses
+            every CPU. The preprocessor and its encoder must be picklable under the spawn start method.
+        commit_every: Number of papers between commits within a batch
         
     Returns:
         dict containing processing statistics
     """
         
     Session = get_or_create_database(db_url)
-    start_time = datetime.now()
+    start_time = time.perf_counter()
     
     stats = {
         "total_papers": 0,
@@ -313,62 +570,82 @@ def process_existing_papers(
                 return stats
                 
             stats["total_papers"] = total_papers
-            logger.info(f"Found {total_papers} papers to process")
+            logger.info("Found %d papers to process", total_papers)
             
             processed = 0
             failed = 0
-            offset = start_offset
+            seen = start_offset
+
+            # Keyset pagination: resume after the last processed id instead of skipping rows
+            last_id = 0
+            if start_offset:
+                last_id = (query
+                    .with_entities(Paper.id)
+                    .order_by(Paper.id)
+                    .offset(start_offset - 1)
+                    .limit(1)
+                    .scalar()) or 0
             
+            # Chunking is CPU bound; fanning it out across processes is opt-in
+            pool = (
+                nullcontext() if max_workers == 1
+                else ProcessPoolExecutor(
+                    max_workers=max_workers or os.cpu_count(),
+                    initializer=init_chunk_worker,
+                    initargs=(preprocessor,)
+                )
+            )
+
             # Process in batches with progress bar
-            with tqdm(total=total_papers, initial=start_offset) as pbar:
-                while offset < total_papers:
+            with pool as executor, tqdm(total=total_papers, initial=start_offset) as pbar:
+                while seen < total_papers:
                     try:
                         # Get batch of papers
                         papers_batch = (query
+                            .options(selectinload(Paper.citations))
+                            .filter(Paper.id > last_id)
                             .order_by(Paper.id)
-                            .offset(offset)
-                            .limit(batch_size)
+                            .limit(min(batch_size, total_papers - seen))
                             .all())
+                    except Exception as query_error:
+                        # Without a batch there is no id to resume from, so stop here
+                        logger.error(f"Error querying batch after id {last_id}: {query_error}")
+                        break
                         
-                        if not papers_batch:
-                            break
-                        
-                        # Process batch
-                        try:
-                            process_papers_batch(
-                                papers=papers_batch,
-                                session=session,
-                                preprocessor=preprocessor,
-                                vectorizer=vectorizer,
-                                batch_size=batch_size
-                            )
-                            processed += len(papers_batch)
-                            
-                        except Exception as batch_error:
-                            logger.error(f"Error processing batch at offset {offset}: {batch_error}")
-                            failed += len(papers_batch)
-                            
-                            # Optionally save error information
-                            failed_ids = [p.arxiv_id for p in papers_batch]
-                            logger.error(f"Failed paper IDs: {failed_ids}")
-                        
-                        # Update progress
-                        pbar.update(len(papers_batch))
-                        pbar.set_description(
-                            f"Processed: {processed}, Failed: {failed}"
+                    if not papers_batch:
+                        break
+
+                    last_id = papers_batch[-1].id
+                    seen += len(papers_batch)
+                    
+                    # Process batch
+                    try:
+                        process_papers_batch(
+                            papers=papers_batch,
+                            session=session,
+                            preprocessor=preprocessor,
+                            vectorizer=vectorizer,
+                            commit_every=commit_every,
+                            executor=executor
                         )
+                        processed += len(papers_batch)
                         
-                    except Exception as query_error:
-                        logger.error(f"Error querying batch at offset {offset}: {query_error}")
-                        failed += batch_size
+                    except Exception as batch_error:
+                        logger.error(f"Error processing batch after id {last_id}: {batch_error}")
+                        failed += len(papers_batch)
+                        
+                        # Optionally save error information
+                        failed_ids = [p.arxiv_id for p in papers_batch]
+                        logger.error(f"Failed paper IDs: {failed_ids}")
                     
-                    finally:
-                        # Always increment offset to avoid infinite loops
-                        offset += batch_size
+                    # Update progress
+                    pbar.update(len(papers_batch))
+                    pbar.set_description(
+                        f"Processed: {processed}, Failed: {failed}"
+                    )
             
             # Calculate final statistics
-            end_time = datetime.now()
-            duration = (end_time - start_time).total_seconds()
+            duration = time.perf_counter() - start_time
             
             stats.update({
                 "processed_papers": processed,
@@ -378,14 +655,15 @@ def process_existing_papers(
             })
             
             # Log final summary
-            logger.info(f"""
-            Processing completed:
-            - Total papers: {total_papers}
-            - Successfully processed: {processed}
-            - Failed to process: {failed}
-            - Time taken: {duration:.2f} seconds
-            - Average rate: {stats['papers_per_second']:.2f} papers/second
-            """)
+            logger.info(
+                "Processing completed:\n"
+                "- Total papers: %d\n"
+                "- Successfully processed: %d\n"
+                "- Failed to process: %d\n"
+                "- Time taken: %.2f seconds\n"
+                "- Average rate: %.2f papers/second",
+                total_papers, processed, failed, duration, stats['papers_per_second']
+            )
             
             return stats
             